@@ -5,92 +5,142 @@ Optimizes HDMI signal chain for minimal handshake delays (bonk), HDR passthrough
 """
 
 import copy
+import functools
+import gc
+import hashlib
 import json
 import os
 import platform
 import re
 import socket
 import sqlite3
-import subprocess
 import shutil
+import threading
+import time
 import uuid
-import xml.etree.ElementTree as ET
 from datetime import datetime
-from flask import Flask, request, jsonify, render_template, send_file, g
+from flask import Flask, Response, request, jsonify, render_template, send_file
 try:
     import fitz as pymupdf  # PyMuPDF
     PDF_SUPPORT = True
 except ImportError:
     PDF_SUPPORT = False
+try:
+    import orjson
+    ORJSON_SUPPORT = True
+except ImportError:
+    ORJSON_SUPPORT = False
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max upload
-app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
-app.config['EXPORT_FOLDER'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exports')
-app.config['BACKUP_FOLDER'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backups')
-app.config['DATABASE'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vrroom_devices.db')
+app.config['UPLOAD_FOLDER'] = os.path.join(BASE_DIR, 'uploads')
+app.config['EXPORT_FOLDER'] = os.path.join(BASE_DIR, 'exports')
+app.config['BACKUP_FOLDER'] = os.path.join(BASE_DIR, 'backups')
+app.config['DATABASE'] = os.path.join(BASE_DIR, 'vrroom_devices.db')
 
 # Ensure directories exist
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-os.makedirs(app.config['EXPORT_FOLDER'], exist_ok=True)
-os.makedirs(app.config['BACKUP_FOLDER'], exist_ok=True)
+for folder in ('UPLOAD_FOLDER', 'EXPORT_FOLDER', 'BACKUP_FOLDER'):
+    os.makedirs(app.config[folder], exist_ok=True)
 
 
 # =============================================================================
 # SQLite Database for Custom Devices
 # =============================================================================
 
-def get_db():
-    """Get database connection for current request."""
-    if 'db' not in g:
-        g.db = sqlite3.connect(app.config['DATABASE'])
-        g.db.row_factory = sqlite3.Row
-    return g.db
+def _loads(data):
+    """Decode a device specs JSON document stored as bytes (or legacy TEXT)."""
+    if ORJSON_SUPPORT:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj):
+    """
+    Encode device specs as UTF-8 JSON bytes with sorted keys (orjson when available).
+    Bytes are stored as a BLOB, so reads skip SQLite's text decode; rows written
+    as TEXT by older versions still load because both decoders accept str.
+    Sorted keys keep the stored form stable for the same specs.
+    """
+    if ORJSON_SUPPORT:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True).encode('utf-8')
+
+
+# Per-connection tuning; journal_mode=WAL is persistent and set once in init_db()
+DB_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+)
 
 
-@app.teardown_appcontext
-def close_db(exception):
-    """Close database connection at end of request."""
-    db = g.pop('db', None)
-    if db is not None:
-        db.close()
+_db_connection = None
+# One connection is shared by all request threads; the lock keeps a thread's
+# transaction from interleaving with statements issued by another thread.
+_db_lock = threading.RLock()
+
+
+def get_db():
+    """Get the shared database connection, opening it on first use."""
+    global _db_connection
+    if _db_connection is None:
+        with _db_lock:
+            if _db_connection is None:
+                # Autocommit mode: multi-statement writes open their own transaction with BEGIN
+                db = sqlite3.connect(app.config['DATABASE'], check_same_thread=False, isolation_level=None)
+                db.row_factory = sqlite3.Row
+                for pragma in DB_PRAGMAS:
+                    db.execute(pragma)
+                _db_connection = db
+    return _db_connection
+
+
+SCHEMA_SQL = '''
+    BEGIN;
+    CREATE TABLE IF NOT EXISTS custom_devices (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        category TEXT NOT NULL,
+        device_id TEXT UNIQUE NOT NULL,
+        name TEXT NOT NULL,
+        device_type TEXT NOT NULL,
+        specs JSON NOT NULL,
+        source_url TEXT,
+        user_added INTEGER DEFAULT 1,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS community_devices (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        category TEXT NOT NULL,
+        device_id TEXT UNIQUE NOT NULL,
+        name TEXT NOT NULL,
+        device_type TEXT NOT NULL,
+        specs JSON NOT NULL,
+        source_url TEXT,
+        submitted_by TEXT,
+        approved INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- (category, name) serves both category lookups and the ORDER BY in get_custom_devices
+    DROP INDEX IF EXISTS idx_custom_category;
+    CREATE INDEX IF NOT EXISTS idx_custom_category_name ON custom_devices(category, name);
+    CREATE INDEX IF NOT EXISTS idx_custom_device_id ON custom_devices(device_id);
+    CREATE INDEX IF NOT EXISTS idx_community_category ON community_devices(category);
+    COMMIT;
+'''
 
 
 def init_db():
     """Initialize database schema."""
     db = sqlite3.connect(app.config['DATABASE'])
-    db.executescript('''
-        CREATE TABLE IF NOT EXISTS custom_devices (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            category TEXT NOT NULL,
-            device_id TEXT UNIQUE NOT NULL,
-            name TEXT NOT NULL,
-            device_type TEXT NOT NULL,
-            specs JSON NOT NULL,
-            source_url TEXT,
-            user_added INTEGER DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-
-        CREATE TABLE IF NOT EXISTS community_devices (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            category TEXT NOT NULL,
-            device_id TEXT UNIQUE NOT NULL,
-            name TEXT NOT NULL,
-            device_type TEXT NOT NULL,
-            specs JSON NOT NULL,
-            source_url TEXT,
-            submitted_by TEXT,
-            approved INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-
-        CREATE INDEX IF NOT EXISTS idx_custom_category ON custom_devices(category);
-        CREATE INDEX IF NOT EXISTS idx_custom_device_id ON custom_devices(device_id);
-        CREATE INDEX IF NOT EXISTS idx_community_category ON community_devices(category);
-    ''')
-    db.commit()
+    db.execute("PRAGMA journal_mode=WAL")
+    # The whole schema runs in one explicit transaction so it is journaled once
+    db.executescript(SCHEMA_SQL)
     db.close()
 
 
@@ -99,107 +149,276 @@ with app.app_context():
     init_db()
 
 
+# Statement text is shared by every call so sqlite3's statement cache always hits
+SQL_SELECT_CUSTOM_DEVICES = '''
+    SELECT category, device_id, name, device_type, specs, source_url
+    FROM custom_devices ORDER BY category, name
+'''
+SQL_INSERT_CUSTOM_DEVICE = '''
+    INSERT INTO custom_devices (category, device_id, name, device_type, specs, source_url)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+SQL_UPDATE_CUSTOM_DEVICE = '''
+    UPDATE custom_devices
+    SET specs = ?, source_url = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE device_id = ?
+'''
+SQL_DELETE_CUSTOM_DEVICE = 'DELETE FROM custom_devices WHERE device_id = ?'
+
+
+def _custom_device_specs(name, device_type, specs_json, source_url):
+    """Decode a custom device row into its API representation."""
+    specs = _loads(specs_json)
+    specs['name'] = name
+    specs['type'] = device_type
+    specs['user_added'] = True
+    specs['source_url'] = source_url
+    return specs
+
+
+# Parsed result of get_custom_devices, reused until the table changes
+_custom_devices_cache = {"data_version": None, "value": None}
+
+
+def _invalidate_custom_devices_cache():
+    """Drop the cached device list after a write through the shared connection."""
+    _custom_devices_cache["data_version"] = None
+    _custom_devices_cache["value"] = None
+
+
 def get_custom_devices():
-    """Get all custom devices from database."""
-    db = get_db()
-    devices = db.execute('SELECT * FROM custom_devices ORDER BY category, name').fetchall()
-    result = {}
-    for device in devices:
-        category = device['category']
-        if category not in result:
-            result[category] = {}
-        specs = json.loads(device['specs'])
-        specs['name'] = device['name']
-        specs['type'] = device['device_type']
-        specs['user_added'] = True
-        specs['source_url'] = device['source_url']
-        result[category][device['device_id']] = specs
-    return result
+    """
+    Get all custom devices from database.
+    The result is cached and shared between callers, so treat it as read-only.
+    """
+    with _db_lock:
+        db = get_db()
+        # data_version only changes for commits made by *other* connections;
+        # writes through this connection clear the cache explicitly instead
+        data_version = db.execute('PRAGMA data_version').fetchone()[0]
+        if _custom_devices_cache["value"] is not None and _custom_devices_cache["data_version"] == data_version:
+            return _custom_devices_cache["value"]
+
+        rows = db.execute(SQL_SELECT_CUSTOM_DEVICES)
+        result = {}
+        for category, device_id, name, device_type, specs_json, source_url in rows:
+            specs = _custom_device_specs(name, device_type, specs_json, source_url)
+            result.setdefault(category, {})[device_id] = specs
+
+        _custom_devices_cache["data_version"] = data_version
+        _custom_devices_cache["value"] = result
+        return result
+
+
+_custom_devices_json_cache = {"entry": None}
+
+
+def get_custom_devices_json():
+    """
+    Get get_custom_devices() serialized as JSON bytes.
+    Encoding happens once per cached device list, and any decode error is
+    raised here, before a response has been started.
+    """
+    custom = get_custom_devices()
+    entry = _custom_devices_json_cache["entry"]
+    if entry is not None and entry[0] is custom:
+        return entry[1]
+
+    # Same encoding as jsonify() so the payload is unchanged
+    body = app.json.response(custom).get_data()
+    _custom_devices_json_cache["entry"] = (custom, body)
+    return body
 
 
 def add_custom_device(category, device_id, name, device_type, specs, source_url=None):
     """Add a custom device to the database."""
-    db = get_db()
-    try:
-        db.execute('''
-            INSERT INTO custom_devices (category, device_id, name, device_type, specs, source_url)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (category, device_id, name, device_type, json.dumps(specs), source_url))
-        db.commit()
-        return {"success": True, "device_id": device_id}
-    except sqlite3.IntegrityError:
-        return {"success": False, "error": "Device ID already exists"}
+    with _db_lock:
+        db = get_db()
+        _invalidate_custom_devices_cache()
+        try:
+            db.execute(SQL_INSERT_CUSTOM_DEVICE, (category, device_id, name, device_type, _dumps(specs), source_url))
+            db.commit()
+            return {"success": True, "device_id": device_id}
+        except sqlite3.IntegrityError:
+            return {"success": False, "error": "Device ID already exists"}
+
+
+def add_custom_devices_bulk(items, batch_size=1000):
+    """
+    Add many custom devices, committing once per batch instead of once per row.
+    Each item is a (category, device_id, name, device_type, specs, source_url) tuple.
+    Returns per-device results in input order.
+    """
+    with _db_lock:
+        db = get_db()
+        _invalidate_custom_devices_cache()
+        rows = [(c, d, n, t, _dumps(s), u) for c, d, n, t, s, u in items]
+        results = []
+
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            db.execute('BEGIN')
+            try:
+                db.executemany(SQL_INSERT_CUSTOM_DEVICE, batch)
+                db.commit()
+                results.extend({"success": True, "device_id": row[1]} for row in batch)
+            except sqlite3.IntegrityError:
+                # A duplicate aborted the batch; retry row by row to report which ones failed
+                db.rollback()
+                db.execute('BEGIN')
+                try:
+                    for row in batch:
+                        try:
+                            db.execute(SQL_INSERT_CUSTOM_DEVICE, row)
+                            results.append({"success": True, "device_id": row[1]})
+                        except sqlite3.IntegrityError:
+                            results.append({"success": False, "device_id": row[1], "error": "Device ID already exists"})
+                    db.commit()
+                except sqlite3.Error:
+                    db.rollback()
+                    raise
+            except sqlite3.Error:
+                # Never leave the shared connection inside an open transaction
+                db.rollback()
+                raise
+
+        added = sum(1 for r in results if r["success"])
+        return {"success": True, "added": added, "failed": len(results) - added, "results": results}
 
 
 def update_custom_device(device_id, specs, source_url=None):
     """Update an existing custom device."""
-    db = get_db()
-    db.execute('''
-        UPDATE custom_devices
-        SET specs = ?, source_url = ?, updated_at = CURRENT_TIMESTAMP
-        WHERE device_id = ?
-    ''', (json.dumps(specs), source_url, device_id))
-    db.commit()
-    return {"success": True}
+    with _db_lock:
+        db = get_db()
+        _invalidate_custom_devices_cache()
+        db.execute(SQL_UPDATE_CUSTOM_DEVICE, (_dumps(specs), source_url, device_id))
+        db.commit()
+        return {"success": True}
 
 
 def delete_custom_device(device_id):
     """Delete a custom device from the database."""
-    db = get_db()
-    db.execute('DELETE FROM custom_devices WHERE device_id = ?', (device_id,))
-    db.commit()
-    return {"success": True}
+    with _db_lock:
+        db = get_db()
+        _invalidate_custom_devices_cache()
+        db.execute(SQL_DELETE_CUSTOM_DEVICE, (device_id,))
+        db.commit()
+        return {"success": True}
+
+
+def update_custom_devices(items):
+    """
+    Update many custom devices in one transaction.
+    Each item is a (device_id, specs, source_url) tuple.
+    """
+    rows = [(_dumps(specs), source_url, device_id) for device_id, specs, source_url in items]
+    with _db_lock:
+        db = get_db()
+        _invalidate_custom_devices_cache()
+        db.execute('BEGIN')
+        try:
+            cursor = db.executemany(SQL_UPDATE_CUSTOM_DEVICE, rows)
+            db.commit()
+        except sqlite3.Error:
+            db.rollback()
+            raise
+        return {"success": True, "updated": cursor.rowcount}
+
+
+def delete_custom_devices(device_ids, chunk_size=500):
+    """
+    Delete many custom devices in one transaction.
+    IDs are bound in chunks to stay under SQLite's host parameter limit.
+    """
+    device_ids = list(device_ids)
+    deleted = 0
+    with _db_lock:
+        db = get_db()
+        _invalidate_custom_devices_cache()
+        db.execute('BEGIN')
+        try:
+            for start in range(0, len(device_ids), chunk_size):
+                chunk = device_ids[start:start + chunk_size]
+                placeholders = ','.join('?' * len(chunk))
+                cursor = db.execute(f'DELETE FROM custom_devices WHERE device_id IN ({placeholders})', chunk)
+                deleted += cursor.rowcount
+            db.commit()
+        except sqlite3.Error:
+            db.rollback()
+            raise
+        return {"success": True, "deleted": deleted}
 
 
 # =============================================================================
 # FFmpeg Path Finder (handles Windows winget installs)
 # =============================================================================
 
+PLATFORM = platform.system()
+
+# Install locations checked after PATH, per platform ({tool} is ffmpeg or ffprobe)
+FFMPEG_SEARCH_PATHS = {
+    # winget, chocolatey, manual installs
+    "Windows": [
+        os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\WinGet\Links\{tool}.exe"),
+        r"C:\ffmpeg\bin\{tool}.exe",
+        r"C:\Program Files\ffmpeg\bin\{tool}.exe",
+        r"C:\ProgramData\chocolatey\bin\{tool}.exe",
+    ],
+    # homebrew
+    "Darwin": [
+        "/opt/homebrew/bin/{tool}",
+        "/usr/local/bin/{tool}",
+    ],
+    "Linux": [
+        "/usr/bin/{tool}",
+        "/usr/local/bin/{tool}",
+        "/snap/bin/{tool}",
+    ],
+}
+
+WINGET_FFMPEG_PACKAGE_DIR = r"%LOCALAPPDATA%\Microsoft\WinGet\Packages\Gyan.FFmpeg_Microsoft.Winget.Source_8wekyb3d8bbwe"
+
+
+@functools.lru_cache(maxsize=1)
+def _find_winget_ffmpeg_bin():
+    """
+    Find the versioned bin directory of a winget FFmpeg install (ffmpeg-<version>\\bin).
+    Scans the package directory once instead of globbing for every tool lookup.
+    """
+    package_dir = os.path.expandvars(WINGET_FFMPEG_PACKAGE_DIR)
+    try:
+        with os.scandir(package_dir) as entries:
+            for entry in entries:
+                if entry.is_dir() and entry.name.startswith("ffmpeg-"):
+                    return os.path.join(entry.path, "bin")
+    except OSError:
+        pass
+    return None
+
+
+@functools.lru_cache(maxsize=8)
 def find_ffmpeg_tool(tool_name):
     """
     Find ffmpeg/ffprobe executable, checking common install locations.
     Returns the full path or None if not found.
+
+    Results are cached for the lifetime of the process, so installing
+    FFmpeg while the server is running requires a restart to be detected.
     """
     # First try PATH
     path = shutil.which(tool_name)
     if path:
         return path
 
-    # Windows-specific paths (winget, chocolatey, manual installs)
-    if platform.system() == "Windows":
-        windows_paths = [
-            os.path.expandvars(rf"%LOCALAPPDATA%\Microsoft\WinGet\Packages\Gyan.FFmpeg_Microsoft.Winget.Source_8wekyb3d8bbwe\ffmpeg-*\bin\{tool_name}.exe"),
-            os.path.expandvars(rf"%LOCALAPPDATA%\Microsoft\WinGet\Links\{tool_name}.exe"),
-            rf"C:\ffmpeg\bin\{tool_name}.exe",
-            rf"C:\Program Files\ffmpeg\bin\{tool_name}.exe",
-            rf"C:\ProgramData\chocolatey\bin\{tool_name}.exe",
-        ]
-        import glob
-        for pattern in windows_paths:
-            matches = glob.glob(pattern)
-            if matches:
-                return matches[0]
-
-    # macOS paths (homebrew)
-    elif platform.system() == "Darwin":
-        mac_paths = [
-            f"/opt/homebrew/bin/{tool_name}",
-            f"/usr/local/bin/{tool_name}",
-        ]
-        for p in mac_paths:
-            if os.path.exists(p):
-                return p
+    candidates = [t.format(tool=tool_name) for t in FFMPEG_SEARCH_PATHS.get(PLATFORM, FFMPEG_SEARCH_PATHS["Linux"])]
+    if PLATFORM == "Windows":
+        winget_bin = _find_winget_ffmpeg_bin()
+        if winget_bin:
+            candidates.insert(0, os.path.join(winget_bin, f"{tool_name}.exe"))
 
-    # Linux paths
-    else:
-        linux_paths = [
-            f"/usr/bin/{tool_name}",
-            f"/usr/local/bin/{tool_name}",
-            f"/snap/bin/{tool_name}",
-        ]
-        for p in linux_paths:
-            if os.path.exists(p):
-                return p
+    for p in candidates:
+        if os.path.exists(p):
+            return p
 
     return None
 
@@ -218,12 +437,55 @@ def get_ffmpeg_path():
 # Vrroom IP Connection
 # =============================================================================
 
+# Short-lived cache of read-only Vrroom queries so UI polling bursts don't
+# re-query the device. Keyed by (ip_address, port, method name).
+VRROOM_CACHE_TTL = 2  # seconds
+_vrroom_cache = {}
+_vrroom_cache_lock = threading.Lock()
+
+
+def vrroom_cached(method):
+    """
+    Cache a successful VrroomConnection query result for VRROOM_CACHE_TTL seconds.
+    Callers get their own copy, so routes may annotate the result freely.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (self.ip_address, self.port, method.__name__)
+        now = time.monotonic()
+        with _vrroom_cache_lock:
+            cached = _vrroom_cache.get(key)
+        if cached and now - cached[0] < VRROOM_CACHE_TTL:
+            return copy.deepcopy(cached[1])
+
+        result = method(self, *args, **kwargs)
+        if result.get("success"):
+            with _vrroom_cache_lock:
+                _vrroom_cache[key] = (now, copy.deepcopy(result))
+        return result
+    return wrapper
+
+
+def bust_vrroom_cache(ip_address, port=None):
+    """Drop cached query results for a Vrroom (all ports if port is None) after a write."""
+    with _vrroom_cache_lock:
+        for key in [k for k in _vrroom_cache if k[0] == ip_address and port in (None, k[1])]:
+            del _vrroom_cache[key]
+
+
 class VrroomConnection:
     """Connect to Vrroom via TCP/Telnet to query settings."""
 
     DEFAULT_PORT = 2222
     TIMEOUT = 5  # seconds
 
+    # Commands are tiny request/response lines: send them without Nagle delay
+    # and let the OS detect a dead control session on long-lived connections.
+    SOCKET_OPTIONS = (
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    )
+
     # Settings to query from Vrroom
     SETTINGS_TO_QUERY = [
         "opmode", "insel", "dhcp", "ipaddr", "autosw",
@@ -237,25 +499,95 @@ class VrroomConnection:
 
     STATUS_QUERIES = ["rx0", "tx0", "tx1", "tx0sink", "tx1sink", "aud0", "audout"]
 
+    # Responses that mean the device has no usable value for a setting
+    _INVALID_VALUES = frozenset({"error", "unknown", ""})
+
+    # EDID modes that need no recommendation in the HDR chain analysis
+    _RECOMMENDED_EDID_MODES = frozenset({"automix", "custom"})
+
+    # Token patterns for _parse_signal_status, matched against the upper-cased response
+    _RESOLUTION_RE = re.compile(r'(?<!\S)(\d+)X(\d+)([PI])(\d+)')
+    _COLOR_SPACE_RE = re.compile(r'(?<!\S)(?:422|444|RGB|420)(?!\S)')
+    _BIT_DEPTH_RE = re.compile(r'(?<!\S)\d+B\S*')
+
+    # HDR signal chain diagnosis stages in chain order: (status query, stage label, stage type)
+    _DIAG_STAGES = (
+        ("rx0", "Input RX0", "input"),
+        ("rx1", "Input RX1", "input"),
+        ("spd0", "SPD 0", "metadata"),
+        ("spd1", "SPD 1", "metadata"),
+        ("tx0", "Output TX0", "output"),
+        ("tx1", "Output TX1", "output"),
+        ("tx0sink", "Sink TX0", "sink"),
+        ("tx1sink", "Sink TX1", "sink"),
+    )
+    DIAG_STATUS_QUERIES = [query for query, _, _ in _DIAG_STAGES]
+
+    # EDID/HDR settings reported alongside the diagnosis
+    DIAG_SETTINGS = [
+        "edidmode", "ediddvflag", "ediddvmode",
+        "edidhdrflag", "edidhdrmode", "hdrcustom",
+        "lldv", "hdrdisable"
+    ]
+
     def __init__(self, ip_address, port=None):
         self.ip_address = ip_address
         self.port = port or self.DEFAULT_PORT
         self.socket = None
+        self._rfile = None
+        self._depth = 0
+
+    def __enter__(self):
+        """Open the connection on the outermost ``with`` and reuse it for nested ones."""
+        if self._depth == 0:
+            self.connect()
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._depth -= 1
+        if self._depth == 0:
+            self.disconnect()
+        return False
 
     def connect(self):
-        """Establish TCP connection to Vrroom."""
+        """Establish TCP connection to Vrroom (no-op if already connected)."""
+        if self.socket:
+            return True
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.settimeout(self.TIMEOUT)
+            for level, option, value in self.SOCKET_OPTIONS:
+                self.socket.setsockopt(level, option, value)
             self.socket.connect((self.ip_address, self.port))
+            # Buffered reader shared by send_command and _pipeline; responses are "\r\n" terminated lines
+            self._rfile = self.socket.makefile('rb', buffering=8192)
             return True
         except socket.timeout:
+            # Drop the half-open socket so a later connect() retries instead of reusing it
+            self.disconnect()
             raise ConnectionError(f"Connection to {self.ip_address}:{self.port} timed out")
         except socket.error as e:
+            self.disconnect()
             raise ConnectionError(f"Failed to connect to {self.ip_address}:{self.port}: {e}")
 
+    def _reconnect(self):
+        """
+        Replace the connection after a read timed out or hit EOF. The buffered
+        reader refuses every read after a timeout, and a late reply left on the
+        old socket would be taken as the answer to the next command.
+        """
+        self.disconnect()
+        self.connect()
+
     def disconnect(self):
         """Close the connection."""
+        if self._rfile:
+            try:
+                self._rfile.close()
+            except Exception:
+                pass
+            self._rfile = None
         if self.socket:
             try:
                 self.socket.close()
@@ -273,289 +605,317 @@ class VrroomConnection:
             cmd = f"{command}\r\n"
             self.socket.sendall(cmd.encode('utf-8'))
 
-            # Read response
-            response = b""
-            while True:
+            # Read response (a single line terminated by \r\n)
+            try:
+                response = self._rfile.readline()
+            except socket.timeout:
+                response = b""
+        except socket.error as e:
+            raise ConnectionError(f"Communication error: {e}")
+
+        if not response:
+            self._reconnect()
+        return response.decode('utf-8').strip()
+
+    def _pipeline(self, commands):
+        """
+        Send several commands in a single write and read one response line per command.
+        Responses come back in command order; commands the device did not answer
+        before the read timed out (or the connection closed) map to None, and
+        the connection is replaced so the next batch starts clean.
+        """
+        if not self.socket:
+            raise ConnectionError("Not connected")
+
+        payload = "".join(f"{command}\r\n" for command in commands)
+        responses = [None] * len(commands)
+        try:
+            self.socket.sendall(payload.encode('utf-8'))
+            for i in range(len(commands)):
                 try:
-                    chunk = self.socket.recv(1024)
-                    if not chunk:
-                        break
-                    response += chunk
-                    # Check if we have a complete response (ends with \r\n)
-                    if response.endswith(b"\r\n"):
-                        break
+                    line = self._rfile.readline()
                 except socket.timeout:
                     break
-
-            return response.decode('utf-8').strip()
+                if not line:
+                    break
+                responses[i] = line.decode('utf-8').strip()
+            else:
+                return responses
         except socket.error as e:
             raise ConnectionError(f"Communication error: {e}")
 
-    def get_setting(self, setting):
-        """Query a single setting."""
-        response = self.send_command(f"get {setting}")
-        # Response format is typically "setting value" or just "value"
-        parts = response.split()
+        self._reconnect()
+        return responses
+
+    @staticmethod
+    def _parse_value(response):
+        """Extract the value from a "get" response."""
+        # Response format is typically "setting value" or just "value";
+        # only the last token is needed, so split once from the right
+        parts = response.rsplit(None, 1)
         if len(parts) >= 2:
             return parts[-1]  # Return last part as value
         return response
 
-    def get_all_settings(self):
-        """Query all relevant settings from Vrroom."""
-        settings = {}
+    def get_setting(self, setting):
+        """Query a single setting."""
+        return self._parse_value(self.send_command(f"get {setting}"))
+
+    def _match_get_replies(self, settings, responses):
+        """
+        Pair pipelined "get" replies with their settings by the setting name each
+        reply starts with, not by position, so a dropped or unexpected line cannot
+        shift values onto the wrong settings. Settings without a matching reply are
+        queried on their own. Returns {setting: value} in query order, leaving out
+        settings that got no answer or an error/unknown value.
+        """
+        replies = {}
+        for response in responses:
+            if response:
+                replies.setdefault(response.split(None, 1)[0], response)
+
+        values = {}
+        for setting in settings:
+            response = replies.get(setting)
+            if response is None:
+                try:
+                    response = self.send_command(f"get {setting}")
+                except Exception:
+                    continue  # Skip settings that fail
+            value = self._parse_value(response)
+            if value.lower() not in self._INVALID_VALUES:
+                values[setting] = value
+
+        return values
 
-        for setting in self.SETTINGS_TO_QUERY:
+    def _pipeline_get(self, settings):
+        """Query several settings in one pipelined batch (see _match_get_replies)."""
+        return self._match_get_replies(settings, self._pipeline([f"get {setting}" for setting in settings]))
+
+    def _replies_in_order(self, commands, responses, complete):
+        """
+        Pair replies that don't name their command (status queries) by position.
+        That only holds if every command in the batch was answered; otherwise the
+        commands are re-run one at a time. Commands that fail map to None.
+        """
+        if complete:
+            return responses
+        ordered = []
+        for command in commands:
             try:
-                value = self.get_setting(setting)
-                if value and value.lower() not in ["error", "unknown"]:
-                    settings[setting] = value
+                ordered.append(self.send_command(command))
             except Exception:
-                continue  # Skip settings that fail
+                ordered.append(None)
+        return ordered
 
-        return settings
+    def get_all_settings(self):
+        """Query all relevant settings from Vrroom."""
+        return self._pipeline_get(self.SETTINGS_TO_QUERY)
 
     def get_status(self):
         """Get current signal status."""
         status = {}
+        commands = [f"get status {query}" for query in self.STATUS_QUERIES]
+        responses = self._pipeline(commands)
+        responses = self._replies_in_order(commands, responses, None not in responses)
 
-        for query in self.STATUS_QUERIES:
-            try:
-                response = self.send_command(f"get status {query}")
-                if response:
-                    status[query] = response
-            except Exception:
-                continue
+        for query, response in zip(self.STATUS_QUERIES, responses):
+            if response:
+                status[query] = response
 
         return status
 
+    @vrroom_cached
     def fetch_config(self):
         """Fetch complete configuration from Vrroom."""
         try:
-            self.connect()
-            settings = self.get_all_settings()
-            status = self.get_status()
-
-            return {
-                "success": True,
-                "ip_address": self.ip_address,
-                "settings": settings,
-                "status": status,
-                "timestamp": datetime.now().isoformat()
-            }
+            with self:
+                settings = self.get_all_settings()
+                status = self.get_status()
+
+                return {
+                    "success": True,
+                    "ip_address": self.ip_address,
+                    "settings": settings,
+                    "status": status,
+                    "timestamp": datetime.now().isoformat()
+                }
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e),
                 "ip_address": self.ip_address
             }
-        finally:
-            self.disconnect()
 
     def set_setting(self, setting, value):
         """Set a single setting on the Vrroom."""
         response = self.send_command(f"set {setting} {value}")
+        bust_vrroom_cache(self.ip_address, self.port)
         return response
 
     def apply_settings(self, settings_dict):
         """Apply multiple settings to the Vrroom. Returns results for each setting."""
         results = {}
         try:
-            self.connect()
-            for setting, value in settings_dict.items():
-                try:
-                    response = self.set_setting(setting, value)
-                    results[setting] = {"success": True, "response": response}
-                except Exception as e:
-                    results[setting] = {"success": False, "error": str(e)}
-            return {"success": True, "results": results}
+            with self:
+                # Writes are answered one line per command, so send them all in one batch
+                responses = self._pipeline([f"set {setting} {value}" for setting, value in settings_dict.items()])
+                bust_vrroom_cache(self.ip_address, self.port)
+                if None not in responses:
+                    for setting, response in zip(settings_dict, responses):
+                        results[setting] = {"success": True, "response": response}
+                    return {"success": True, "results": results}
+
+                # A write went unanswered, so the replies that did arrive can't be
+                # matched to settings by position. Resend one at a time (writing the
+                # same value again is harmless) so each result belongs to its setting.
+                for setting, value in settings_dict.items():
+                    try:
+                        response = self.set_setting(setting, value)
+                    except Exception as e:
+                        results[setting] = {"success": False, "error": str(e)}
+                        continue
+                    if response:
+                        results[setting] = {"success": True, "response": response}
+                    else:
+                        results[setting] = {"success": False, "error": "No response from Vrroom"}
+                return {"success": True, "results": results}
         except Exception as e:
             return {"success": False, "error": str(e)}
-        finally:
-            self.disconnect()
 
     def backup_config(self, backup_path=None):
         """Backup all Vrroom settings to a JSON file."""
         try:
-            self.connect()
-            settings = self.get_all_settings()
-            status = self.get_status()
-
-            backup_data = {
-                "vrroom_backup": True,
-                "version": "1.0",
-                "ip_address": self.ip_address,
-                "timestamp": datetime.now().isoformat(),
-                "settings": settings,
-                "status_snapshot": status
-            }
+            with self:
+                settings = self.get_all_settings()
+                status = self.get_status()
+
+                backup_data = {
+                    "vrroom_backup": True,
+                    "version": "1.0",
+                    "ip_address": self.ip_address,
+                    "timestamp": datetime.now().isoformat(),
+                    "settings": settings,
+                    "status_snapshot": status
+                }
 
-            if backup_path:
-                with open(backup_path, "w") as f:
-                    json.dump(backup_data, f, indent=2)
+                if backup_path:
+                    with open(backup_path, "w") as f:
+                        json.dump(backup_data, f, indent=2)
 
-            return {"success": True, "backup": backup_data, "filepath": backup_path}
+                return {"success": True, "backup": backup_data, "filepath": backup_path}
         except Exception as e:
             return {"success": False, "error": str(e)}
-        finally:
-            self.disconnect()
 
+    @vrroom_cached
     def detect_inputs(self):
         """Detect connected devices on Vrroom inputs by parsing status."""
         try:
-            self.connect()
-            detected = {
-                "rx0": {"connected": False, "signal": None, "resolution": None},
-                "rx1": {"connected": False, "signal": None, "resolution": None},
-            }
-
-            # Query input status
-            for rx in ["rx0", "rx1"]:
-                try:
-                    response = self.send_command(f"get status {rx}")
-                    if response and "no signal" not in response.lower():
-                        detected[rx]["connected"] = True
-                        detected[rx]["signal"] = response
-                        # Try to parse resolution from response
-                        # Typical format: "3840x2160p60 422 12b HDR BT2020 ..."
-                        parts = response.split()
-                        if parts:
-                            detected[rx]["resolution"] = parts[0]
-                except Exception:
-                    pass
+            with self:
+                detected = {
+                    "rx0": {"connected": False, "signal": None, "resolution": None},
+                    "rx1": {"connected": False, "signal": None, "resolution": None},
+                }
 
-            # Also get input selection
-            try:
-                insel = self.send_command("get insel")
+                # Input status and input selection are independent, so ask for them in one batch
+                commands = ["get status rx0", "get status rx1", "get insel"]
+                responses = self._pipeline(commands)
+                rx0, rx1, insel = self._replies_in_order(commands, responses, None not in responses)
+                responses = {"rx0": rx0, "rx1": rx1}
+
+                # Query input status
+                for rx in ["rx0", "rx1"]:
+                    try:
+                        response = responses[rx] or ""
+                        if response and "no signal" not in response.lower():
+                            detected[rx]["connected"] = True
+                            detected[rx]["signal"] = response
+                            # Try to parse resolution from response
+                            # Typical format: "3840x2160p60 422 12b HDR BT2020 ..."
+                            parts = response.split()
+                            if parts:
+                                detected[rx]["resolution"] = parts[0]
+                    except Exception:
+                        pass
+
+                # Also get input selection
                 detected["active_input"] = insel
-            except Exception:
-                detected["active_input"] = None
 
-            return {"success": True, "inputs": detected}
+                return {"success": True, "inputs": detected}
         except Exception as e:
             return {"success": False, "error": str(e)}
-        finally:
-            self.disconnect()
 
+    @vrroom_cached
     def diagnose_hdr_signal_chain(self):
         """
         Diagnose HDR signal path through the Vrroom.
         Returns detailed info about HDR/DV status at each point in the chain.
         """
         try:
-            self.connect()
-            diagnosis = {
-                "success": True,
-                "timestamp": datetime.now().isoformat(),
-                "signal_chain": [],
-                "hdr_status": {
-                    "input": {"detected": False, "format": "SDR", "details": None},
-                    "processing": {"lldv_active": False, "hdr_inject": False},
-                    "output": {"format": "SDR", "details": None}
-                },
-                "settings": {},
-                "issues": [],
-                "recommendations": []
-            }
-
-            # 1. Query input status (what's coming from sources)
-            for rx in ["rx0", "rx1"]:
-                try:
-                    response = self.send_command(f"get status {rx}")
-                    if response and "no signal" not in response.lower():
-                        signal_info = self._parse_signal_status(response, rx)
-                        diagnosis["signal_chain"].append({
-                            "stage": f"Input {rx.upper()}",
-                            "type": "input",
-                            "connected": True,
-                            **signal_info
-                        })
-                        # Check if this input has HDR
-                        if signal_info.get("hdr_format") != "SDR":
-                            diagnosis["hdr_status"]["input"]["detected"] = True
-                            diagnosis["hdr_status"]["input"]["format"] = signal_info.get("hdr_format", "SDR")
-                            diagnosis["hdr_status"]["input"]["details"] = signal_info
-                    else:
-                        diagnosis["signal_chain"].append({
-                            "stage": f"Input {rx.upper()}",
-                            "type": "input",
-                            "connected": False,
-                            "raw": response
-                        })
-                except Exception as e:
-                    diagnosis["signal_chain"].append({
-                        "stage": f"Input {rx.upper()}",
-                        "type": "input",
-                        "error": str(e)
-                    })
-
-            # 2. Query SPD (Source Product Descriptor) info - contains HDR metadata
-            for spd in ["spd0", "spd1"]:
-                try:
-                    response = self.send_command(f"get status {spd}")
-                    if response:
-                        diagnosis["signal_chain"].append({
-                            "stage": f"SPD {spd[-1]}",
-                            "type": "metadata",
-                            "raw": response,
-                            **self._parse_spd_status(response)
-                        })
-                except Exception:
-                    pass
-
-            # 3. Query output status (what's going to display/AVR)
-            for tx in ["tx0", "tx1"]:
-                try:
-                    response = self.send_command(f"get status {tx}")
-                    if response:
-                        signal_info = self._parse_signal_status(response, tx)
-                        diagnosis["signal_chain"].append({
-                            "stage": f"Output {tx.upper()}",
-                            "type": "output",
-                            **signal_info
-                        })
-                        # Track output HDR format
-                        if signal_info.get("hdr_format") != "SDR":
-                            diagnosis["hdr_status"]["output"]["format"] = signal_info.get("hdr_format")
-                            diagnosis["hdr_status"]["output"]["details"] = signal_info
-                except Exception as e:
-                    diagnosis["signal_chain"].append({
-                        "stage": f"Output {tx.upper()}",
-                        "type": "output",
-                        "error": str(e)
-                    })
-
-            # 4. Query sink capabilities (what display/AVR can accept)
-            for sink in ["tx0sink", "tx1sink"]:
-                try:
-                    response = self.send_command(f"get status {sink}")
-                    if response:
-                        diagnosis["signal_chain"].append({
-                            "stage": f"Sink {sink[-5:-4].upper()}{sink[-4:]}",
-                            "type": "sink",
-                            "raw": response,
-                            **self._parse_sink_capabilities(response)
-                        })
-                except Exception:
-                    pass
-
-            # 5. Query current EDID/HDR settings
-            edid_settings = [
-                "edidmode", "ediddvflag", "ediddvmode",
-                "edidhdrflag", "edidhdrmode", "hdrcustom",
-                "lldv", "hdrdisable"
-            ]
-            for setting in edid_settings:
-                try:
-                    value = self.get_setting(setting)
-                    if value and value.lower() not in ["error", "unknown"]:
-                        diagnosis["settings"][setting] = value
-                except Exception:
-                    pass
-
-            # 6. Analyze the chain and generate issues/recommendations
-            self._analyze_hdr_chain(diagnosis)
+            with self:
+                diagnosis = {
+                    "success": True,
+                    "timestamp": datetime.now().isoformat(),
+                    "signal_chain": [],
+                    "hdr_status": {
+                        "input": {"detected": False, "format": "SDR", "details": None},
+                        "processing": {"lldv_active": False, "hdr_inject": False},
+                        "output": {"format": "SDR", "details": None}
+                    },
+                    "settings": {},
+                    "issues": [],
+                    "recommendations": []
+                }
 
-            return diagnosis
+                # Every stage below is independent, so all status queries and the
+                # EDID/HDR settings go out in a single pipelined batch and are
+                # parsed from the responses.
+                status_commands = [f"get status {q}" for q in self.DIAG_STATUS_QUERIES]
+                responses = self._pipeline(status_commands + [f"get {setting}" for setting in self.DIAG_SETTINGS])
+                status_responses = self._replies_in_order(
+                    status_commands, responses[:len(status_commands)], None not in responses
+                )
+
+                # 1-4. Inputs (what's coming from sources), SPD metadata, outputs
+                # (what's going to display/AVR) and sink capabilities, in chain order
+                for (query, label, stage_type), response in zip(self._DIAG_STAGES, status_responses):
+                    response = response or ""
+                    entry = {"stage": label, "type": stage_type}
+                    try:
+                        if stage_type == "input" and (not response or "no signal" in response.lower()):
+                            entry["connected"] = False
+                            entry["raw"] = response
+                        elif not response:
+                            continue
+                        elif stage_type == "metadata":
+                            entry["raw"] = response
+                            entry.update(self._parse_spd_status(response))
+                        elif stage_type == "sink":
+                            entry["raw"] = response
+                            entry.update(self._parse_sink_capabilities(response))
+                        else:
+                            signal_info = self._parse_signal_status(response, query)
+                            if stage_type == "input":
+                                entry["connected"] = True
+                            entry.update(signal_info)
+                            # Track the HDR format seen at this point of the chain
+                            if signal_info.get("hdr_format") != "SDR":
+                                hdr_status = diagnosis["hdr_status"][stage_type]
+                                if stage_type == "input":
+                                    hdr_status["detected"] = True
+                                hdr_status["format"] = signal_info.get("hdr_format", "SDR")
+                                hdr_status["details"] = signal_info
+                    except Exception as e:
+                        entry["error"] = str(e)
+                    diagnosis["signal_chain"].append(entry)
+
+                # 5. Current EDID/HDR settings
+                diagnosis["settings"].update(self._match_get_replies(self.DIAG_SETTINGS, responses))
+
+                # 6. Analyze the chain and generate issues/recommendations
+                self._analyze_hdr_chain(diagnosis)
+
+                return diagnosis
 
         except Exception as e:
             return {
@@ -563,8 +923,6 @@ class VrroomConnection:
                 "error": str(e),
                 "ip_address": self.ip_address
             }
-        finally:
-            self.disconnect()
 
     def _parse_signal_status(self, response, port):
         """Parse signal status string to extract video format info."""
@@ -581,38 +939,37 @@ class VrroomConnection:
         if not response:
             return info
 
-        parts = response.upper().split()
+        upper = response.upper()
+        parts = set(upper.split())
 
+        # Each pattern only matches at the start of a whitespace-separated token,
+        # so a single search over the response finds the first matching token.
         # Parse resolution (e.g., 3840x2160p60)
-        for part in parts:
-            res_match = re.match(r'(\d+)X(\d+)([PI])(\d+)', part)
-            if res_match:
-                info["resolution"] = f"{res_match.group(1)}x{res_match.group(2)}"
-                info["refresh_rate"] = int(res_match.group(4))
-                info["scan_type"] = "progressive" if res_match.group(3) == 'P' else "interlaced"
-                break
+        res_match = self._RESOLUTION_RE.search(upper)
+        if res_match:
+            info["resolution"] = f"{res_match.group(1)}x{res_match.group(2)}"
+            info["refresh_rate"] = int(res_match.group(4))
+            info["scan_type"] = "progressive" if res_match.group(3) == 'P' else "interlaced"
 
         # Parse color space (422, 444, RGB)
-        for part in parts:
-            if part in ['422', '444', 'RGB', '420']:
-                info["color_space"] = part
-                break
+        color_match = self._COLOR_SPACE_RE.search(upper)
+        if color_match:
+            info["color_space"] = color_match.group(0)
 
         # Parse bit depth
-        for part in parts:
-            if re.match(r'\d+B', part):
-                info["bit_depth"] = part
-                break
+        depth_match = self._BIT_DEPTH_RE.search(upper)
+        if depth_match:
+            info["bit_depth"] = depth_match.group(0)
 
         # Parse HDR format
-        if 'DV' in parts or 'DOLBY' in response.upper():
-            if 'LLDV' in response.upper():
+        if 'DV' in parts or 'DOLBY' in upper:
+            if 'LLDV' in upper:
                 info["hdr_format"] = "LLDV"
             else:
                 info["hdr_format"] = "Dolby Vision"
-        elif 'HDR10+' in response.upper() or 'HDR10PLUS' in response.upper():
+        elif 'HDR10+' in upper or 'HDR10PLUS' in upper:
             info["hdr_format"] = "HDR10+"
-        elif 'HDR10' in response.upper() or 'HDR' in parts:
+        elif 'HDR10' in upper or 'HDR' in parts:
             info["hdr_format"] = "HDR10"
         elif 'HLG' in parts:
             info["hdr_format"] = "HLG"
@@ -620,9 +977,9 @@ class VrroomConnection:
             info["hdr_format"] = "SDR"
 
         # Parse colorimetry (BT.2020, BT.709)
-        if 'BT2020' in response.upper() or 'BT.2020' in response.upper():
+        if 'BT2020' in upper or 'BT.2020' in upper:
             info["colorimetry"] = "BT.2020"
-        elif 'BT709' in response.upper() or 'BT.709' in response.upper():
+        elif 'BT709' in upper or 'BT.709' in upper:
             info["colorimetry"] = "BT.709"
 
         return info
@@ -635,9 +992,10 @@ class VrroomConnection:
             "hdr_metadata": None
         }
         # SPD typically contains vendor/product info and HDR metadata
-        if 'HDR' in response.upper():
+        upper = response.upper()
+        if 'HDR' in upper:
             info["hdr_metadata"] = "HDR metadata present"
-        if 'DV' in response.upper() or 'DOLBY' in response.upper():
+        if 'DV' in upper or 'DOLBY' in upper:
             info["hdr_metadata"] = "Dolby Vision metadata"
         return info
 
@@ -670,6 +1028,8 @@ class VrroomConnection:
         issues = []
         recommendations = []
         settings = diagnosis.get("settings", {})
+        # Lower-case once; the checks below compare against lower-case values
+        settings_lc = {key: value.lower() for key, value in settings.items()}
 
         # Check if input has HDR but output is SDR
         input_hdr = diagnosis["hdr_status"]["input"]["format"]
@@ -683,7 +1043,7 @@ class VrroomConnection:
             })
 
             # Check EDID settings
-            if settings.get("edidhdrflag", "").lower() == "off":
+            if settings_lc.get("edidhdrflag") == "off":
                 recommendations.append({
                     "priority": "high",
                     "setting": "edidhdrflag",
@@ -695,7 +1055,7 @@ class VrroomConnection:
                     "menu_path": "Vrroom Web UI > EDID > HDR FLAG"
                 })
 
-            if settings.get("hdrdisable", "").lower() == "on":
+            if settings_lc.get("hdrdisable") == "on":
                 recommendations.append({
                     "priority": "high",
                     "setting": "hdrdisable",
@@ -709,7 +1069,7 @@ class VrroomConnection:
 
         # Check for Dolby Vision to LLDV conversion
         if input_hdr == "Dolby Vision":
-            if settings.get("ediddvflag", "").lower() != "on":
+            if settings_lc.get("ediddvflag") != "on":
                 recommendations.append({
                     "priority": "medium",
                     "setting": "ediddvflag",
@@ -722,8 +1082,8 @@ class VrroomConnection:
                 })
 
         # Check EDID mode
-        edid_mode = settings.get("edidmode", "").lower()
-        if edid_mode not in ["automix", "custom"]:
+        edid_mode = settings_lc.get("edidmode", "")
+        if edid_mode not in self._RECOMMENDED_EDID_MODES:
             recommendations.append({
                 "priority": "medium",
                 "setting": "edidmode",
@@ -751,48 +1111,46 @@ class VrroomConnection:
         diagnosis["issues"] = issues
         diagnosis["recommendations"] = recommendations
 
+    @vrroom_cached
     def get_all_settings_detailed(self):
         """Get all settings with their current values and metadata for UI display."""
         try:
-            self.connect()
-            settings_list = []
-
-            # Extended list of queryable settings
-            all_settings = [
-                "opmode", "insel", "autosw", "edidmode",
-                "ediddvflag", "ediddvmode", "edidhdrflag", "edidhdrmode",
-                "edidvrrflag", "edidallmflag", "edidfrlflag", "edidfrlmode",
-                "hdrcustom", "hdrdisable", "vrr", "allm", "frl",
-                "earc", "earcforce", "audioout", "unmutedelay",
-                "downscale", "cec", "hdcp", "oled", "oledfade",
-                "jvcmacro", "edidtruehdflag", "edidtruehdmode",
-                "edidddflag", "edidddplusflag", "ediddtsflag", "ediddtshdflag",
-                "edidpcmflag", "edidpcmchmode"
-            ]
+            with self:
+                settings_list = []
+
+                # Extended list of queryable settings
+                all_settings = [
+                    "opmode", "insel", "autosw", "edidmode",
+                    "ediddvflag", "ediddvmode", "edidhdrflag", "edidhdrmode",
+                    "edidvrrflag", "edidallmflag", "edidfrlflag", "edidfrlmode",
+                    "hdrcustom", "hdrdisable", "vrr", "allm", "frl",
+                    "earc", "earcforce", "audioout", "unmutedelay",
+                    "downscale", "cec", "hdcp", "oled", "oledfade",
+                    "jvcmacro", "edidtruehdflag", "edidtruehdmode",
+                    "edidddflag", "edidddplusflag", "ediddtsflag", "ediddtshdflag",
+                    "edidpcmflag", "edidpcmchmode"
+                ]
 
-            for setting in all_settings:
-                try:
-                    value = self.get_setting(setting)
-                    if value and value.lower() not in ["error", "unknown", ""]:
-                        meta = VRROOM_SETTINGS_META.get(setting, {})
-                        settings_list.append({
-                            "key": setting,
-                            "value": value,
-                            "name": meta.get("name", setting),
-                            "menu_path": meta.get("menu_path", "Vrroom Web UI"),
-                            "tab": meta.get("tab", "Settings"),
-                            "description": meta.get("description", ""),
-                            "values": meta.get("values", {}),
-                            "can_modify": True
-                        })
-                except Exception:
-                    continue
+                values = self._pipeline_get(all_settings)
+
+                for setting, value in values.items():
+                    name, menu_path, tab, description, value_map = (
+                        _SETTINGS_META_CACHE.get(setting) or (setting, *_DEFAULT_SETTINGS_META)
+                    )
+                    settings_list.append({
+                        "key": setting,
+                        "value": value,
+                        "name": name,
+                        "menu_path": menu_path,
+                        "tab": tab,
+                        "description": description,
+                        "values": value_map,
+                        "can_modify": True
+                    })
 
-            return {"success": True, "settings": settings_list}
+                return {"success": True, "settings": settings_list}
         except Exception as e:
             return {"success": False, "error": str(e)}
-        finally:
-            self.disconnect()
 
 
 # =============================================================================
@@ -865,6 +1223,30 @@ DEVICE_MANUALS = {
 # Device Database
 # =============================================================================
 
+# Menu paths shared by models with identical menu trees; profiles reference
+# one dict instead of carrying their own copy.
+# JVC DLA-NZ7 / DLA-NZ8
+JVC_NZ_CONFIG_PATHS = {
+    "picture_mode": "Menu > Picture > Picture Mode",
+    "hdr_setting": "Menu > Picture > HDR Setting > HDR Level",
+    "gamma": "Menu > Picture > Gamma",
+    "hdmi_signal": "Menu > Input/Output > HDMI > Input Level",
+    "frame_interp": "Menu > Picture > Motion Enhance > Clear Motion Drive",
+    "lens_memory": "Menu > Installation > Lens Control > Lens Memory",
+}
+
+# Denon AVR-X3800H / AVR-X4800H and Marantz Cinema 50 (same Sound United setup menu)
+DENON_MARANTZ_CONFIG_PATHS = {
+    "speaker_setup": "Setup > Speakers > Manual Setup > Speaker Config",
+    "crossover": "Setup > Speakers > Manual Setup > Crossovers",
+    "distance": "Setup > Speakers > Manual Setup > Distances",
+    "level": "Setup > Speakers > Manual Setup > Levels",
+    "room_correction": "Setup > Speakers > Audyssey Setup",
+    "surround_decode": "Setup > Surround Parameter > Surround Parameter",
+    "hdmi_audio": "Setup > HDMI Setup > Audio Output",
+    "earc": "Setup > HDMI Setup > eARC",
+}
+
 DEVICE_PROFILES = {
     "displays": {
         "epson_eh_ls12000b": {
@@ -934,14 +1316,7 @@ DEVICE_PROFILES = {
             "panel_tech": "D-ILA (native 4K)",
             "lens_shift": True,
             "lens_memory": True,
-            "config_paths": {
-                "picture_mode": "Menu > Picture > Picture Mode",
-                "hdr_setting": "Menu > Picture > HDR Setting > HDR Level",
-                "gamma": "Menu > Picture > Gamma",
-                "hdmi_signal": "Menu > Input/Output > HDMI > Input Level",
-                "frame_interp": "Menu > Picture > Motion Enhance > Clear Motion Drive",
-                "lens_memory": "Menu > Installation > Lens Control > Lens Memory",
-            },
+            "config_paths": JVC_NZ_CONFIG_PATHS,
             "recommended_settings": {
                 "color_mode_sdr": "Natural",
                 "color_mode_hdr": "Frame Adapt HDR",
@@ -968,14 +1343,7 @@ DEVICE_PROFILES = {
             "panel_tech": "D-ILA (e-Shift 4K)",
             "lens_shift": True,
             "lens_memory": True,
-            "config_paths": {
-                "picture_mode": "Menu > Picture > Picture Mode",
-                "hdr_setting": "Menu > Picture > HDR Setting > HDR Level",
-                "gamma": "Menu > Picture > Gamma",
-                "hdmi_signal": "Menu > Input/Output > HDMI > Input Level",
-                "frame_interp": "Menu > Picture > Motion Enhance > Clear Motion Drive",
-                "lens_memory": "Menu > Installation > Lens Control > Lens Memory",
-            },
+            "config_paths": JVC_NZ_CONFIG_PATHS,
             "recommended_settings": {
                 "color_mode_hdr": "Frame Adapt HDR",
                 "frame_interpolation": "Off or Low",
@@ -1835,16 +2203,7 @@ DEVICE_PROFILES = {
             "room_correction": "Audyssey MultEQ XT32",
             "room_correction_mic": "Audyssey microphone (included)",
             "dirac_support": True,
-            "config_paths": {
-                "speaker_setup": "Setup > Speakers > Manual Setup > Speaker Config",
-                "crossover": "Setup > Speakers > Manual Setup > Crossovers",
-                "distance": "Setup > Speakers > Manual Setup > Distances",
-                "level": "Setup > Speakers > Manual Setup > Levels",
-                "room_correction": "Setup > Speakers > Audyssey Setup",
-                "surround_decode": "Setup > Surround Parameter > Surround Parameter",
-                "hdmi_audio": "Setup > HDMI Setup > Audio Output",
-                "earc": "Setup > HDMI Setup > eARC",
-            },
+            "config_paths": DENON_MARANTZ_CONFIG_PATHS,
             "notes": "Excellent HDMI 2.1. Audyssey XT32 room correction. Dirac Live upgrade available."
         },
         "denon_avr_x4800h": {
@@ -1864,16 +2223,7 @@ DEVICE_PROFILES = {
             "room_correction": "Audyssey MultEQ XT32",
             "room_correction_mic": "Audyssey microphone (included)",
             "dirac_support": True,
-            "config_paths": {
-                "speaker_setup": "Setup > Speakers > Manual Setup > Speaker Config",
-                "crossover": "Setup > Speakers > Manual Setup > Crossovers",
-                "distance": "Setup > Speakers > Manual Setup > Distances",
-                "level": "Setup > Speakers > Manual Setup > Levels",
-                "room_correction": "Setup > Speakers > Audyssey Setup",
-                "surround_decode": "Setup > Surround Parameter > Surround Parameter",
-                "hdmi_audio": "Setup > HDMI Setup > Audio Output",
-                "earc": "Setup > HDMI Setup > eARC",
-            },
+            "config_paths": DENON_MARANTZ_CONFIG_PATHS,
             "notes": "11.4ch processing. Dirac Live ready. Audyssey XT32 included."
         },
         "marantz_cinema_50": {
@@ -1893,16 +2243,7 @@ DEVICE_PROFILES = {
             "room_correction": "Audyssey MultEQ XT32",
             "room_correction_mic": "Audyssey microphone (included)",
             "dirac_support": True,
-            "config_paths": {
-                "speaker_setup": "Setup > Speakers > Manual Setup > Speaker Config",
-                "crossover": "Setup > Speakers > Manual Setup > Crossovers",
-                "distance": "Setup > Speakers > Manual Setup > Distances",
-                "level": "Setup > Speakers > Manual Setup > Levels",
-                "room_correction": "Setup > Speakers > Audyssey Setup",
-                "surround_decode": "Setup > Surround Parameter > Surround Parameter",
-                "hdmi_audio": "Setup > HDMI Setup > Audio Output",
-                "earc": "Setup > HDMI Setup > eARC",
-            },
+            "config_paths": DENON_MARANTZ_CONFIG_PATHS,
             "notes": "Premium audio processing. Same HDMI board as Denon. Audyssey XT32 + Dirac available."
         },
         "anthem_mrx_1140": {
@@ -2944,37 +3285,69 @@ VRROOM_SETTINGS_META = {
     }
 }
 
+# (name, menu_path, tab, description, values) per setting with the UI defaults
+# filled in, so the detailed settings list and get_vrroom_setting_display
+# need one lookup per setting
+_SETTINGS_META_CACHE = {
+    key: (
+        meta.get("name", key),
+        meta.get("menu_path", "Vrroom Web UI"),
+        meta.get("tab", "Settings"),
+        meta.get("description", ""),
+        meta.get("values", {}),
+    )
+    for key, meta in VRROOM_SETTINGS_META.items()
+}
+_DEFAULT_SETTINGS_META = ("Vrroom Web UI", "Settings", "", {})
+
+# Raw values (lowercased) that mean a setting is switched on
+_ENABLED_TOKENS = frozenset({"on", "enabled", "1", "true", "yes", "automix"})
+
+# (display_value, is_enabled) for every documented raw value of each setting
+_SETTING_VALUE_DISPLAY = {
+    (key, raw): (display, raw.lower() in _ENABLED_TOKENS)
+    for key, (_, _, _, _, values_map) in _SETTINGS_META_CACHE.items()
+    if isinstance(values_map, dict)
+    for raw, display in values_map.items()
+}
+
 
 def get_vrroom_setting_display(setting_key, value):
     """Convert RS232 setting to human-readable format."""
-    meta = VRROOM_SETTINGS_META.get(setting_key, {})
-    if not meta:
+    sval = str(value)
+    meta = _SETTINGS_META_CACHE.get(setting_key)
+    if meta is None:
         return {
             "name": setting_key,
-            "value": str(value),
-            "display_value": str(value),
+            "value": sval,
+            "display_value": sval,
             "menu_path": "Vrroom Web UI",
             "tab": "Settings",
             "is_set": True
         }
 
-    # Get human-readable value
-    values_map = meta.get("values", {})
-    if isinstance(values_map, dict):
-        display_value = values_map.get(str(value), str(value))
+    name, menu_path, tab, description, values_map = meta
+
+    known = _SETTING_VALUE_DISPLAY.get((setting_key, sval))
+    if known is not None:
+        display_value, is_enabled = known
     else:
-        display_value = f"{value} ({values_map})"
+        # Get human-readable value
+        if isinstance(values_map, dict):
+            display_value = sval
+        else:
+            display_value = f"{value} ({values_map})"
 
-    # Determine if this is "enabled/on" state
-    is_enabled = str(value).lower() in ["on", "enabled", "1", "true", "yes", "automix"]
+        # Determine if this is "enabled/on" state
+        is_enabled = sval.lower() in _ENABLED_TOKENS
 
     return {
-        "name": meta.get("name", setting_key),
+        "name": name,
         "value": value,
         "display_value": display_value,
-        "menu_path": meta.get("menu_path", "Vrroom Web UI"),
-        "tab": meta.get("tab", "Settings"),
-        "description": meta.get("description", ""),
+        "menu_path": menu_path,
+        "tab": tab,
+        "description": description,
         "is_set": is_enabled
     }
 
@@ -3406,54 +3779,63 @@ SPEAKER_TUNING_GUIDES = {
 }
 
 
+# Navigation paths for common source settings, by device id and setting type
+_DEVICE_SETTINGS_PATHS = {
+    "nvidia_shield_pro": {
+        "resolution": "Settings > Device Preferences > Display & Sound > Resolution",
+        "frame_rate": "Settings > Device Preferences > Display & Sound > Match content frame rate",
+        "hdr": "Settings > Device Preferences > Display & Sound > Dynamic range > set to Auto",
+        "audio": "Settings > Device Preferences > Display & Sound > Advanced sound settings > Surround sound > Auto",
+        "dv": "Settings > Device Preferences > Display & Sound > Dolby Vision > set to Enabled"
+    },
+    "apple_tv_4k": {
+        "resolution": "Settings > Video and Audio > Format > 4K SDR 60Hz",
+        "frame_rate": "Settings > Video and Audio > Match Content > Match Frame Rate > On",
+        "hdr": "Settings > Video and Audio > Match Content > Match Dynamic Range > On",
+        "audio": "Settings > Video and Audio > Audio Format > Dolby Atmos (if available)",
+        "dv": "Settings > Video and Audio > Match Content > Match Dynamic Range > On (enables DV when available)"
+    },
+    "xbox_series_x": {
+        "resolution": "Settings > General > TV & Display Options > Resolution > 4K UHD",
+        "frame_rate": "Settings > General > TV & Display Options > Refresh Rate > 120 Hz",
+        "hdr": "Settings > General > TV & Display Options > Video Modes > Allow HDR10 > checked",
+        "audio": "Settings > General > Volume & Audio Output > HDMI audio > Bitstream out > Dolby Atmos for Home Theater",
+        "vrr": "Settings > General > TV & Display Options > Video Modes > Allow Variable Refresh Rate > checked",
+        "allm": "Settings > General > TV & Display Options > Video Modes > Allow Auto Low Latency Mode > checked"
+    },
+    "ps5": {
+        "resolution": "Settings > Screen and Video > Video Output > Resolution > 2160p",
+        "frame_rate": "Settings > Screen and Video > Video Output > Enable 120 Hz Output > Automatic",
+        "hdr": "Settings > Screen and Video > Video Output > HDR > On When Supported",
+        "audio": "Settings > Sound > Audio Output > Audio Format (Priority) > Bitstream (Dolby)",
+        "vrr": "Settings > Screen and Video > Video Output > VRR > Automatic"
+    },
+    "zidoo_z9x_pro": {
+        "resolution": "Settings > Display > Resolution > 3840x2160p Auto",
+        "frame_rate": "Settings > Display > Match Frame Rate > On",
+        "hdr": "Settings > Display > HDR > Auto",
+        "audio": "Settings > Audio > HDMI Audio > Auto",
+        "dv": "Settings > Display > Dolby Vision > VS10 Engine"
+    },
+    "kaleidescape_strato": {
+        "resolution": "Kaleidescape App > Settings > Video > Output Resolution > Auto",
+        "frame_rate": "Kaleidescape App > Settings > Video > Match Frame Rate > On",
+        "hdr": "Kaleidescape App > Settings > Video > HDR > Auto",
+        "audio": "Kaleidescape App > Settings > Audio > Digital Audio > Bitstream"
+    }
+}
+
+# Same paths keyed by (device_id, setting_type) for single-lookup access
+_SETTINGS_PATHS = {
+    (device_id, setting_type): path
+    for device_id, device_paths in _DEVICE_SETTINGS_PATHS.items()
+    for setting_type, path in device_paths.items()
+}
+
+
 def _get_settings_path(device_id, setting_type):
     """Get step-by-step navigation path for a device setting."""
-    paths = {
-        "nvidia_shield_pro": {
-            "resolution": "Settings > Device Preferences > Display & Sound > Resolution",
-            "frame_rate": "Settings > Device Preferences > Display & Sound > Match content frame rate",
-            "hdr": "Settings > Device Preferences > Display & Sound > Dynamic range > set to Auto",
-            "audio": "Settings > Device Preferences > Display & Sound > Advanced sound settings > Surround sound > Auto",
-            "dv": "Settings > Device Preferences > Display & Sound > Dolby Vision > set to Enabled"
-        },
-        "apple_tv_4k": {
-            "resolution": "Settings > Video and Audio > Format > 4K SDR 60Hz",
-            "frame_rate": "Settings > Video and Audio > Match Content > Match Frame Rate > On",
-            "hdr": "Settings > Video and Audio > Match Content > Match Dynamic Range > On",
-            "audio": "Settings > Video and Audio > Audio Format > Dolby Atmos (if available)",
-            "dv": "Settings > Video and Audio > Match Content > Match Dynamic Range > On (enables DV when available)"
-        },
-        "xbox_series_x": {
-            "resolution": "Settings > General > TV & Display Options > Resolution > 4K UHD",
-            "frame_rate": "Settings > General > TV & Display Options > Refresh Rate > 120 Hz",
-            "hdr": "Settings > General > TV & Display Options > Video Modes > Allow HDR10 > checked",
-            "audio": "Settings > General > Volume & Audio Output > HDMI audio > Bitstream out > Dolby Atmos for Home Theater",
-            "vrr": "Settings > General > TV & Display Options > Video Modes > Allow Variable Refresh Rate > checked",
-            "allm": "Settings > General > TV & Display Options > Video Modes > Allow Auto Low Latency Mode > checked"
-        },
-        "ps5": {
-            "resolution": "Settings > Screen and Video > Video Output > Resolution > 2160p",
-            "frame_rate": "Settings > Screen and Video > Video Output > Enable 120 Hz Output > Automatic",
-            "hdr": "Settings > Screen and Video > Video Output > HDR > On When Supported",
-            "audio": "Settings > Sound > Audio Output > Audio Format (Priority) > Bitstream (Dolby)",
-            "vrr": "Settings > Screen and Video > Video Output > VRR > Automatic"
-        },
-        "zidoo_z9x_pro": {
-            "resolution": "Settings > Display > Resolution > 3840x2160p Auto",
-            "frame_rate": "Settings > Display > Match Frame Rate > On",
-            "hdr": "Settings > Display > HDR > Auto",
-            "audio": "Settings > Audio > HDMI Audio > Auto",
-            "dv": "Settings > Display > Dolby Vision > VS10 Engine"
-        },
-        "kaleidescape_strato": {
-            "resolution": "Kaleidescape App > Settings > Video > Output Resolution > Auto",
-            "frame_rate": "Kaleidescape App > Settings > Video > Match Frame Rate > On",
-            "hdr": "Kaleidescape App > Settings > Video > HDR > Auto",
-            "audio": "Kaleidescape App > Settings > Audio > Digital Audio > Bitstream"
-        }
-    }
-    device_paths = paths.get(device_id, {})
-    return device_paths.get(setting_type, "")
+    return _SETTINGS_PATHS.get((device_id, setting_type), "")
 
 
 # =============================================================================
@@ -4673,9 +5055,9 @@ class PrerollAnalyzer:
         if not self.ffprobe_path:
             # Provide more helpful error with install instructions
             install_hint = ""
-            if platform.system() == "Windows":
+            if PLATFORM == "Windows":
                 install_hint = " Run: winget install -e --id Gyan.FFmpeg then restart your terminal."
-            elif platform.system() == "Darwin":
+            elif PLATFORM == "Darwin":
                 install_hint = " Run: brew install ffmpeg"
             else:
                 install_hint = " Run: sudo apt install ffmpeg (Debian/Ubuntu) or equivalent."
@@ -4708,6 +5090,7 @@ class PrerollAnalyzer:
             self.file_path
         ]
 
+        import subprocess
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
         if result.returncode != 0:
             raise RuntimeError(f"FFprobe failed: {result.stderr}")
@@ -5353,6 +5736,7 @@ class AVRConfigAnalyzer:
 
     def _parse_xml(self):
         """Parse XML config file."""
+        import xml.etree.ElementTree as ET
         try:
             root = ET.fromstring(self.content)
             self._walk_xml(root, "")
@@ -5666,6 +6050,7 @@ class MediaServerConfigAnalyzer:
             return "kodi"
 
         # Check XML root element
+        import xml.etree.ElementTree as ET
         try:
             root = ET.fromstring(self.content)
             if root.tag == "Preferences":
@@ -5679,6 +6064,7 @@ class MediaServerConfigAnalyzer:
 
     def _parse_xml(self):
         """Parse XML config file."""
+        import xml.etree.ElementTree as ET
         try:
             root = ET.fromstring(self.content)
 
@@ -6196,10 +6582,10 @@ def vrroom_command():
         return jsonify({"error": "Only 'get' and 'set' commands are allowed"}), 400
 
     try:
-        connection = VrroomConnection(ip_address, int(port))
-        connection.connect()
-        response = connection.send_command(command)
-        connection.disconnect()
+        with VrroomConnection(ip_address, int(port)) as connection:
+            response = connection.send_command(command)
+        if cmd_lower.startswith("set "):
+            bust_vrroom_cache(connection.ip_address, connection.port)
 
         return jsonify({
             "success": True,
@@ -6268,10 +6654,8 @@ def vrroom_set_setting():
     value = data.get("value")
 
     try:
-        connection = VrroomConnection(ip, int(port))
-        connection.connect()
-        response = connection.set_setting(setting, value)
-        connection.disconnect()
+        with VrroomConnection(ip, int(port)) as connection:
+            response = connection.set_setting(setting, value)
 
         return jsonify({
             "success": True,
@@ -6339,32 +6723,76 @@ def download_config(filename):
     return send_file(filepath, as_attachment=True, download_name=filename)
 
 
-@app.route("/api/devices")
-def get_devices():
-    """Get device profiles database including custom devices."""
+# (custom devices dict the merge was built from, merged result); get_custom_devices
+# returns the same dict object until the table changes, so identity marks staleness
+_all_devices_cache = {"entry": None}
+
+
+def get_all_devices():
+    """
+    Get built-in device profiles merged with custom devices.
+    The merge is only rebuilt when the custom device list changes; the result
+    is shared between callers, so treat it as read-only.
+    """
+    try:
+        custom = get_custom_devices()
+    except Exception:
+        custom = {}  # Database might not be available in all contexts
+
+    entry = _all_devices_cache["entry"]
+    if entry is not None and entry[0] is custom:
+        return entry[1]
+
     # Start with built-in profiles
     all_devices = {}
     for category, devices in DEVICE_PROFILES.items():
         all_devices[category] = dict(devices)
 
     # Merge custom devices from database
-    try:
-        custom = get_custom_devices()
-        for category, devices in custom.items():
-            if category not in all_devices:
-                all_devices[category] = {}
-            all_devices[category].update(devices)
-    except Exception:
-        pass  # Database might not be available in all contexts
+    for category, devices in custom.items():
+        if category not in all_devices:
+            all_devices[category] = {}
+        all_devices[category].update(devices)
+
+    _all_devices_cache["entry"] = (custom, all_devices)
+    return all_devices
+
+
+_all_devices_json_cache = {"entry": None}
+
+
+def get_all_devices_json():
+    """
+    Get get_all_devices() serialized as JSON bytes plus a content-derived ETag.
+    Serialization and hashing happen once per merged catalog.
+    """
+    all_devices = get_all_devices()
+    entry = _all_devices_json_cache["entry"]
+    if entry is not None and entry[0] is all_devices:
+        return entry[1], entry[2]
+
+    # Same encoding as jsonify() so the payload is unchanged
+    body = app.json.response(all_devices).get_data()
+    etag = hashlib.sha256(body).hexdigest()[:16]
+    _all_devices_json_cache["entry"] = (all_devices, body, etag)
+    return body, etag
 
-    return jsonify(all_devices)
+
+@app.route("/api/devices")
+def get_devices():
+    """Get device profiles database including custom devices."""
+    body, etag = get_all_devices_json()
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    # Answers If-None-Match with 304 Not Modified and no body
+    return response.make_conditional(request)
 
 
 @app.route("/api/devices/custom", methods=["GET"])
 def get_custom_devices_api():
     """Get only custom user-added devices."""
     try:
-        return jsonify(get_custom_devices())
+        return Response(get_custom_devices_json(), mimetype="application/json")
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -6399,6 +6827,85 @@ def add_custom_device_api():
         return jsonify(result), 400
 
 
+@app.route("/api/devices/custom/bulk", methods=["POST"])
+def add_custom_devices_bulk_api():
+    """Add many custom devices in one request (e.g. community device import)."""
+    data = request.get_json()
+    if not isinstance(data, dict) or not isinstance(data.get("devices"), list):
+        return jsonify({"error": "A 'devices' list is required"}), 400
+
+    required = ["category", "device_id", "name", "device_type"]
+    items = []
+    for index, device in enumerate(data["devices"]):
+        if not isinstance(device, dict):
+            return jsonify({"error": f"Device {index}: must be an object"}), 400
+        for field in required:
+            if field not in device:
+                return jsonify({"error": f"Device {index}: missing required field: {field}"}), 400
+            if not isinstance(device[field], str):
+                return jsonify({"error": f"Device {index}: {field} must be a string"}), 400
+        if not isinstance(device.get("specs", {}), dict):
+            return jsonify({"error": f"Device {index}: specs must be an object"}), 400
+        if not isinstance(device.get("source_url"), (str, type(None))):
+            return jsonify({"error": f"Device {index}: source_url must be a string"}), 400
+        items.append((
+            device["category"],
+            device["device_id"],
+            device["name"],
+            device["device_type"],
+            device.get("specs", {}),
+            device.get("source_url")
+        ))
+
+    try:
+        result = add_custom_devices_bulk(items)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    return jsonify(result), 201 if result["added"] else 400
+
+
+@app.route("/api/devices/custom", methods=["PUT"])
+def update_custom_devices_api():
+    """Update many custom devices in one request."""
+    data = request.get_json()
+    if not isinstance(data, dict) or not isinstance(data.get("devices"), list):
+        return jsonify({"error": "A 'devices' list is required"}), 400
+
+    items = []
+    for index, device in enumerate(data["devices"]):
+        if not isinstance(device, dict):
+            return jsonify({"error": f"Device {index}: must be an object"}), 400
+        if "device_id" not in device:
+            return jsonify({"error": f"Device {index}: missing required field: device_id"}), 400
+        if not isinstance(device["device_id"], str):
+            return jsonify({"error": f"Device {index}: device_id must be a string"}), 400
+        if not isinstance(device.get("specs", {}), dict):
+            return jsonify({"error": f"Device {index}: specs must be an object"}), 400
+        if not isinstance(device.get("source_url"), (str, type(None))):
+            return jsonify({"error": f"Device {index}: source_url must be a string"}), 400
+        items.append((device["device_id"], device.get("specs", {}), device.get("source_url")))
+
+    try:
+        return jsonify(update_custom_devices(items))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/devices/custom", methods=["DELETE"])
+def delete_custom_devices_api():
+    """Delete many custom devices in one request."""
+    data = request.get_json()
+    if not isinstance(data, dict) or not isinstance(data.get("device_ids"), list):
+        return jsonify({"error": "A 'device_ids' list is required"}), 400
+    if not all(isinstance(device_id, str) for device_id in data["device_ids"]):
+        return jsonify({"error": "Every entry in 'device_ids' must be a string"}), 400
+
+    try:
+        return jsonify(delete_custom_devices(data["device_ids"]))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route("/api/devices/custom/<device_id>", methods=["PUT"])
 def update_custom_device_api(device_id):
     """Update an existing custom device."""
@@ -6675,6 +7182,8 @@ def download_backup(filename):
 @app.route("/api/preroll/encode", methods=["POST"])
 def encode_preroll():
     """Re-encode pre-roll to target format (runs FFmpeg on server)."""
+    import subprocess
+
     if "file" not in request.files:
         return jsonify({"error": "No file uploaded"}), 400
 
@@ -6814,7 +7323,7 @@ def health_check():
         "ffmpeg_available": ffmpeg_path is not None,
         "ffmpeg_path": ffmpeg_path,
         "pdf_support": PDF_SUPPORT,
-        "platform": platform.system(),
+        "platform": PLATFORM,
         "version": "1.3.0"
     })
 
@@ -6837,4 +7346,8 @@ if __name__ == "__main__":
     print("  Starting server at http://localhost:5000")
     print("=" * 60 + "\n")
 
+    # The device catalog and settings tables live for the whole process;
+    # move them out of the collector's generations so GC passes skip them.
+    gc.freeze()
+
     app.run(host="0.0.0.0", port=5000, debug=debug)